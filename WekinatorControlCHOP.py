@@ -16,113 +16,159 @@
 # autonomous integration with Wekinator is required.
 #
 # Dependencies:
-# - None external (standard Python + TouchDesigner context)
+# - None external (standard Python + TouchDesigner context, incl. bundled NumPy)
 # =============================================================================
 
 
 import td
+import numpy as np
+import os
+import sys
+import errno
+import ctypes
 import socket
+import selectors
 import struct
 import threading
+import functools
 import collections
 
 # --- OSC SENDING FUNCTION (EXAMPLE METHOD) ---
 def send_osc_message(host, port, address, *args):
-    # prepare address and pad
-    msg = address.encode('utf-8') + b'\0'
-    msg += (b'\0' * ((4 - len(msg) % 4) % 4))
-    # typetags and data
-    typetags = ','
-    data_bytes = b''
-    for arg in args:
-        if isinstance(arg, float):
-            typetags += 'f'
-            data_bytes += struct.pack('>f', arg)
-        elif isinstance(arg, int):
-            typetags += 'i'
-            data_bytes += struct.pack('>i', arg)
-        elif isinstance(arg, str):
-            typetags += 's'
-            data_bytes += arg.encode('utf-8') + b'\0'
-            data_bytes += (b'\0' * ((4 - len(arg) % 4) % 4))
-    # pad typetag
-    msg += typetags.encode('utf-8') + b'\0'
-    msg += (b'\0' * ((4 - len(msg) % 4) % 4))
-    msg += data_bytes
-    # send
+    send_osc_bytes(host, port, build_osc(address, *args))
+
+def send_osc_bytes(host, port, msg):
+    global _send_sock
+    # send through the shared socket (created lazily, closed in onExit)
     try:
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-            s.sendto(msg, (host, port))
+        if _send_sock is None:
+            _send_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        _send_sock.sendto(msg, (resolve_host(host), port))
         # debug prints commented out for performance
     except Exception:
         pass
 
+def resolve_host(host):
+    # hostnames are looked up once, not on every per-frame sendto
+    ip = _host_cache.get(host)
+    if ip is None:
+        ip = _host_cache[host] = socket.gethostbyname(host)
+    return ip
+
 # --- Safely reset any previous socket/thread ---
 try:
+    old_stop = globals().get('recv_stop')
+    if old_stop:
+        old_stop.set()
     old_socket = globals().get('sock_in')
     if old_socket:
+        try: old_socket.shutdown(socket.SHUT_RDWR)
+        except: pass
         old_socket.close()
+    old_thread = globals().get('recv_thread')
+    if old_thread:
+        old_thread.join(timeout=0.5)
 except:
     pass
 try:
-    if hasattr(init_sockets, '_thread_started'):
-        init_sockets._thread_started = False
+    old_send = globals().get('_send_sock')
+    if old_send:
+        old_send.close()
 except:
     pass
 
 # --- OSC packing/unpacking utilities ---
 def pad4(data: bytes) -> bytes:
-    return data + (b"\0" * ((4 - len(data) % 4) % 4))
+    return data + (b"\0" * (-len(data) & 3))
+
+_PACK_F = struct.Struct('>f').pack
+_PACK_I = struct.Struct('>i').pack
+_UNPACK_F = struct.Struct('>f').unpack_from
+_UNPACK_I = struct.Struct('>i').unpack_from
+
+@functools.lru_cache(maxsize=32)
+def _float_struct(n: int) -> struct.Struct:
+    return struct.Struct('>' + 'f'*n)
+
+@functools.lru_cache(maxsize=32)
+def _int_struct(n: int) -> struct.Struct:
+    return struct.Struct('>' + 'i'*n)
+
+@functools.lru_cache(maxsize=64)
+def _osc_header(address: str, tags: bytes) -> bytes:
+    # address and typetags are NUL-terminated, then padded to 4 bytes;
+    # the set of message shapes is small, so each header is built once
+    return pad4(address.encode('utf-8') + b'\0') + pad4(b',' + tags + b'\0')
 
 def build_osc(address: str, *args) -> bytes:
-    msg = pad4(address.encode('utf-8'))
-    typetags = ','
-    data_bytes = b''
+    # uniform argument lists get templated typetags and a single Struct pack:
+    # no args (control commands), all floats (inputs), all ints (ids/indices)
+    if not args:
+        return _osc_header(address, b'')
+    if all(isinstance(a, float) for a in args):
+        return _osc_header(address, b'f'*len(args)) + _float_struct(len(args)).pack(*args)
+    if all(isinstance(a, int) for a in args):
+        return _osc_header(address, b'i'*len(args)) + _int_struct(len(args)).pack(*args)
+    typetags = bytearray()
+    data_bytes = bytearray()
     for arg in args:
         if isinstance(arg, float):
-            typetags += 'f'; data_bytes += struct.pack('>f', arg)
+            typetags += b'f'; data_bytes += _PACK_F(arg)
         elif isinstance(arg, int):
-            typetags += 'i'; data_bytes += struct.pack('>i', arg)
+            typetags += b'i'; data_bytes += _PACK_I(arg)
         elif isinstance(arg, str):
-            typetags += 's'; data_bytes += pad4(arg.encode('utf-8'))
-    msg += pad4(typetags.encode('utf-8'))
-    msg += data_bytes
-    return msg
+            typetags += b's'; data_bytes += pad4(arg.encode('utf-8') + b'\0')
+    return _osc_header(address, bytes(typetags)) + data_bytes
 
-def unpack_osc_packet(packet: bytes):
+def unpack_osc_packet(packet, size=None):
+    # packet may be a reused bytearray of which only the first size bytes count
     try:
-        e = packet.find(b'\0')
+        # NUL search runs in C (bytes.find); fields are decoded from
+        # zero-copy memoryview slices instead of sliced bytes copies
+        if size is None: size = len(packet)
+        mv = memoryview(packet)[:size]
+        e = packet.find(b'\0', 0, size)
         if e < 0: return None, [], []
-        addr = packet[:e].decode('utf-8')
-        ts = ((e + 4)//4)*4
-        te = packet.find(b'\0', ts)
+        addr = str(mv[:e], 'utf-8')
+        ts = (e + 4) & ~3
+        te = packet.find(b'\0', ts, size)
         if te < 0: return addr, [], []
-        tags = packet[ts:te].decode('utf-8')
-        if not tags.startswith(','): return addr, [], []
-        tags = tags[1:]
-        ds = ((te + 4)//4)*4
+        if mv[ts:ts+1] != b',': return addr, [], []
+        tags = str(mv[ts+1:te], 'utf-8')
+        ds = (te + 4) & ~3
+        # homogeneous float/int payloads (typical Wekinator outputs) in one call
+        if tags and not tags.strip('f'):
+            return addr, list(tags), list(_float_struct(len(tags)).unpack_from(mv, ds))
+        if tags and not tags.strip('i'):
+            return addr, list(tags), list(_int_struct(len(tags)).unpack_from(mv, ds))
         vals, off = [], ds
         for t in tags:
             if t == 'f':
-                vals.append(struct.unpack('>f', packet[off:off+4])[0]); off += 4
+                vals.append(_UNPACK_F(mv, off)[0]); off += 4
             elif t == 'i':
-                vals.append(struct.unpack('>i', packet[off:off+4])[0]); off += 4
+                vals.append(_UNPACK_I(mv, off)[0]); off += 4
             elif t == 's':
-                se = packet.find(b'\0', off)
-                vals.append(packet[off:se].decode('utf-8'))
-                off = ((se + 4)//4)*4
+                se = packet.find(b'\0', off, size)
+                vals.append(str(mv[off:se], 'utf-8'))
+                off = (se + 4) & ~3
         return addr, list(tags), vals
     except:
         return None, [], []
 
 # --- Global state ---
+_send_sock          = None
+_host_cache         = {}
 sock_in             = None
+recv_thread         = None
+recv_stop           = threading.Event()
 wekinator_recording = False
 wekinator_trained   = False
 wekinator_running   = False
-data_lock           = threading.Lock()
-received_osc_data   = collections.defaultdict(list)
+osc_inbox           = collections.deque(maxlen=4096)  # (addr, vals) from recv thread
+dtw_inbox           = collections.deque(maxlen=4096)  # gesture ids from recv thread
+received_osc_data   = collections.defaultdict(list)   # latest vals per addr (cook thread)
 dtw_triggers        = {}
+dtw_gids            = {}                              # addr -> DTW gesture id or None
 
 # --- Default OSC settings ---
 TD_LISTEN_PORT        = 12000
@@ -131,50 +177,140 @@ WEKINATOR_LISTEN_PORT = 6448
 OSC_INPUT_MSG         = '/wek/inputs'
 OSC_OUTPUT_MSG        = '/wek/outputs'
 
-def recv_loop():
-    while sock_in:
-        try:
-            pkt, _ = sock_in.recvfrom(4096)
-            addr, tags, vals = unpack_osc_packet(pkt)
-            if not addr: continue
-            with data_lock:
-                if addr.startswith('/output_'):
-                    try:
-                        idx = int(addr.rsplit('_',1)[1])
-                        dtw_triggers[idx] = 1
-                    except:
-                        received_osc_data[addr] = vals
-                else:
-                    received_osc_data[addr] = vals
-        except socket.error:
-            break
-        except:
-            break
+# --- Batched receive (Linux recvmmsg, one datagram per call elsewhere) ---
+RECV_BATCH        = 64
+RECV_SIZE         = 4096
+RECV_BUFFER_BYTES = 2*1024*1024
+MSG_WAITFORONE    = 0x10000
 
-def init_sockets(op):
-    global sock_in
+class _iovec(ctypes.Structure):
+    _fields_ = [('iov_base', ctypes.c_void_p), ('iov_len', ctypes.c_size_t)]
+
+class _msghdr(ctypes.Structure):
+    _fields_ = [('msg_name', ctypes.c_void_p), ('msg_namelen', ctypes.c_uint32),
+                ('msg_iov', ctypes.POINTER(_iovec)), ('msg_iovlen', ctypes.c_size_t),
+                ('msg_control', ctypes.c_void_p), ('msg_controllen', ctypes.c_size_t),
+                ('msg_flags', ctypes.c_int)]
+
+class _mmsghdr(ctypes.Structure):
+    _fields_ = [('msg_hdr', _msghdr), ('msg_len', ctypes.c_uint)]
+
+_recvmmsg = None
+if sys.platform.startswith('linux'):
+    try:
+        _recvmmsg = ctypes.CDLL('libc.so.6', use_errno=True).recvmmsg
+        _recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_mmsghdr), ctypes.c_uint,
+                              ctypes.c_int, ctypes.c_void_p]
+        _recvmmsg.restype  = ctypes.c_int
+    except (OSError, AttributeError):
+        _recvmmsg = None
+
+def make_recv_batch():
+    # persistent receive buffers, reused for every datagram
+    bufs = [bytearray(RECV_SIZE) for _ in range(RECV_BATCH if _recvmmsg else 1)]
+    if _recvmmsg is None: return bufs, None, None
+    views = [(ctypes.c_char * RECV_SIZE).from_buffer(b) for b in bufs]
+    msgs  = (_mmsghdr * RECV_BATCH)()
+    iovs  = (_iovec * RECV_BATCH)()
+    for i in range(RECV_BATCH):
+        iovs[i].iov_base, iovs[i].iov_len = ctypes.addressof(views[i]), RECV_SIZE
+        msgs[i].msg_hdr.msg_iov    = ctypes.pointer(iovs[i])
+        msgs[i].msg_hdr.msg_iovlen = 1
+    return bufs, (views, iovs), msgs
+
+def recv_packets(sock, batch):
+    # non-blocking: returns (buffer, nbytes) for whatever is queued (up to
+    # RECV_BATCH), [] when empty; buffers are overwritten by the next call
+    bufs, _, msgs = batch
+    if msgs is None:
+        try: n, _ = sock.recvfrom_into(bufs[0])
+        except (BlockingIOError, InterruptedError): return []
+        return [(bufs[0], n)]
+    n = _recvmmsg(sock.fileno(), msgs, RECV_BATCH, MSG_WAITFORONE, None)
+    if n < 0:
+        err = ctypes.get_errno()
+        if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR): return []
+        raise OSError(err, os.strerror(err))
+    return [(bufs[i], msgs[i].msg_len) for i in range(n)]
+
+def parse_dtw_gid(addr):
+    # '/output_<N>' is a DTW gesture event; anything else is regular data
+    if addr.startswith('/output_'):
+        try: return int(addr[len('/output_'):])
+        except ValueError: pass
+    return None
+
+def handle_packet(pkt, size=None):
+    addr, tags, vals = unpack_osc_packet(pkt, size)
+    if not addr: return
+    # the address set is tiny, so each one is classified only once
+    if addr in dtw_gids:
+        gid = dtw_gids[addr]
+    else:
+        if len(dtw_gids) > 1024: dtw_gids.clear()
+        gid = dtw_gids[addr] = parse_dtw_gid(addr)
+    # deque appends are atomic, so the cook thread never waits on us
+    if gid is not None: dtw_inbox.append(gid)
+    else:               osc_inbox.append((addr, vals))
+
+def recv_loop(sock, stop):
+    batch = make_recv_batch()
+    sel = selectors.DefaultSelector()
+    try:
+        sel.register(sock, selectors.EVENT_READ)
+        # wake when data is queued (or every 100 ms to check stop), then drain
+        while not stop.is_set():
+            if not sel.select(timeout=0.1): continue
+            pkts = recv_packets(sock, batch)
+            while pkts:
+                for buf,n in pkts: handle_packet(buf, n)
+                pkts = recv_packets(sock, batch)
+    except:
+        pass
+    finally:
+        sel.close()
+
+def close_receiver_socket(sock):
+    # shutdown() wakes a recv blocked in the receive thread; close() alone may not
+    try: sock.shutdown(socket.SHUT_RDWR)
+    except: pass
+    try: sock.close()
+    except: pass
+
+def stop_receiver():
+    global sock_in, recv_thread
+    recv_stop.set()
     if sock_in:
-        try: sock_in.close()
-        except: pass
+        close_receiver_socket(sock_in)
         sock_in = None
+    if recv_thread:
+        recv_thread.join(timeout=0.5)
+        recv_thread = None
+
+def init_sockets(op):
+    global sock_in, recv_thread
+    stop_receiver()
     try:
         port = op.par.Tdlistenport.eval()
         sock_in = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         sock_in.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         sock_in.bind(('0.0.0.0', port))
-        sock_in.setblocking(True)
+        sock_in.setblocking(False)
+        # large kernel buffer absorbs Wekinator bursts while TD is busy cooking
+        try: sock_in.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECV_BUFFER_BYTES)
+        except OSError: pass
     except Exception as e:
         op.addError(f"Cannot bind listening port {port}: {e}")
         sock_in = None
         return
-    init_sockets._thread = threading.Thread(target=recv_loop, daemon=True)
-    init_sockets._thread.start()
-    init_sockets._thread_started = True
+    recv_stop.clear()
+    recv_thread = threading.Thread(target=recv_loop, args=(sock_in, recv_stop), daemon=True)
+    recv_thread.start()
 
-def send_to_wekinator(op, address, *args):
-    host = op.par.Wekinatorhost.eval()
-    port = op.par.Wekinatorlistenport.eval()
-    send_osc_message(host, port, address, *args)
+def send_inputs(host, port, address, chop, n):
+    # first sample of each input channel, byte-swapped to OSC big-endian in bulk
+    arr = chop.numpyArray()[:n, 0].astype('>f4')
+    send_osc_bytes(host, port, _osc_header(address, b'f'*len(arr)) + arr.tobytes())
 
 def onSetupParameters(op):
     if op.customPages: return
@@ -223,94 +359,119 @@ def onSetupParameters(op):
     pg.appendPulse('Enablemodelrunning',    label='Enable Model Running')
     pg.appendPulse('Disablemodelrunning',   label='Disable Model Running')
 
+def csv_list(text, conv):
+    try: return [conv(v.strip()) for v in text.split(',') if v.strip()]
+    except: return []
+
+def command(address, build=lambda p: []):
+    # pulse handler sending address with the args build() reads from op.par
+    return lambda op, host, port: send_osc_message(host, port, address, *build(op.par))
+
+def send_now(op, host, port):
+    if op.inputs:
+        send_inputs(host, port, op.par.Inputmessage.eval(), op.inputs[0], op.par.Numinputs.eval())
+
+model_list = lambda p: csv_list(p.Modellist.eval(), int)
+name_list  = lambda p: csv_list(p.Namelist.eval(), str)
+
 pulse_map = {
-    'Canceltrain':          '/wekinator/control/cancelTrain',
-    'Deleteallexamples':    '/wekinator/control/deleteAllExamples',
-    'Deleteoutputexamples': '/wekinator/control/deleteExamplesForOutput',
-    'Startdtwrecording':    '/wekinator/control/startDtwRecording',
-    'Stopdtwrecording':     '/wekinator/control/stopDtwRecording',
-    'Sendoutputvalues':     '/wekinator/control/outputs',
-    'Setinputnames':        '/wekinator/control/setInputNames',
-    'Setoutputnames':       '/wekinator/control/setOutputNames',
-    'Enablemodelrecording': '/wekinator/control/enableModelRecording',
-    'Disablemodelrecording':'/wekinator/control/disableModelRecording',
-    'Enablemodelrunning':   '/wekinator/control/enableModelRunning',
-    'Disablemodelrunning':  '/wekinator/control/disableModelRunning',
+    'Sendnow':              send_now,
+    'Canceltrain':          command('/wekinator/control/cancelTrain'),
+    'Deleteallexamples':    command('/wekinator/control/deleteAllExamples'),
+    'Deleteoutputexamples': command('/wekinator/control/deleteExamplesForOutput', lambda p: [p.Targetoutput.eval()]),
+    'Startdtwrecording':    command('/wekinator/control/startDtwRecording',       lambda p: [p.Gestureid.eval()]),
+    'Stopdtwrecording':     command('/wekinator/control/stopDtwRecording'),
+    'Sendoutputvalues':     command('/wekinator/control/outputs',                 lambda p: csv_list(p.Setoutputvalues.eval(), float)),
+    'Setinputnames':        command('/wekinator/control/setInputNames',           name_list),
+    'Setoutputnames':       command('/wekinator/control/setOutputNames',          name_list),
+    'Enablemodelrecording': command('/wekinator/control/enableModelRecording',    model_list),
+    'Disablemodelrecording':command('/wekinator/control/disableModelRecording',   model_list),
+    'Enablemodelrunning':   command('/wekinator/control/enableModelRunning',      model_list),
+    'Disablemodelrunning':  command('/wekinator/control/disableModelRunning',     model_list),
 }
 
 def onPulse(par):
-    op = par.owner
-    if par.name == 'Sendnow':
-        if op.inputs:
-            vals = [c[0] for c in op.inputs[0].chans()[:op.par.Numinputs.eval()]]
-            send_to_wekinator(op, op.par.Inputmessage.eval(), *vals)
-        return
-    if par.name in pulse_map:
-        cmd = pulse_map[par.name]; args = []
-        if par.name == 'Startdtwrecording':
-            args = [op.par.Gestureid.eval()]
-        elif par.name == 'Deleteoutputexamples':
-            args = [op.par.Targetoutput.eval()]
-        elif par.name == 'Sendoutputvalues':
-            try: args = [float(v) for v in op.par.Setoutputvalues.eval().split(',') if v.strip()]
-            except: pass
-        elif par.name in ('Setinputnames','Setoutputnames'):
-            args = [s.strip() for s in op.par.Namelist.eval().split(',') if s.strip()]
-        elif par.name in ('Enablemodelrecording','Disablemodelrecording','Enablemodelrunning','Disablemodelrunning'):
-            try: args = [int(i) for i in op.par.Modellist.eval().split(',') if i.strip()]
-            except: pass
-        send_to_wekinator(op, cmd, *args)
+    handler = pulse_map.get(par.name)
+    if handler:
+        op = par.owner
+        handler(op, op.par.Wekinatorhost.eval(), op.par.Wekinatorlistenport.eval())
+
+def build_chan_names(main, layout, gids):
+    names = [f'output{i+1}' for addr,n in layout if addr == main for i in range(n)]
+    for addr,n in layout:
+        if addr == main: continue
+        base = addr.replace('/','_').strip('_')
+        names += [f'{base}{i+1}' for i in range(n)]
+    names += [f'dtw_event_{gid}' for gid in gids]
+    return names
 
 def onCook(op):
+    global wekinator_recording, wekinator_trained, wekinator_running
     if not op.customPages: onSetupParameters(op)
-    if sock_in is None or not getattr(init_sockets,'_thread_started',False):
+    if sock_in is None or recv_thread is None or not recv_thread.is_alive():
         init_sockets(op)
-    op.isTimeSlice = False; op.clear()
+    op.isTimeSlice = False
+
+    # read each parameter once per cook
+    p = op.par
+    host, port = p.Wekinatorhost.eval(), p.Wekinatorlistenport.eval()
 
     # poll toggles
-    rec = bool(op.par.Record.eval())
+    rec = bool(p.Record.eval())
     if rec != wekinator_recording:
-        globals()['wekinator_recording'] = rec
-        send_to_wekinator(op, '/wekinator/control/startRecording' if rec else '/wekinator/control/stopRecording')
+        wekinator_recording = rec
+        send_osc_message(host, port, '/wekinator/control/startRecording' if rec else '/wekinator/control/stopRecording')
 
-    trn = bool(op.par.Train.eval())
+    trn = bool(p.Train.eval())
     if trn != wekinator_trained:
-        globals()['wekinator_trained'] = trn
-        send_to_wekinator(op, '/wekinator/control/train' if trn else '/wekinator/control/cancelTrain')
+        wekinator_trained = trn
+        send_osc_message(host, port, '/wekinator/control/train' if trn else '/wekinator/control/cancelTrain')
 
-    run = bool(op.par.Run.eval())
+    run = bool(p.Run.eval())
     if run != wekinator_running:
-        globals()['wekinator_running'] = run
-        send_to_wekinator(op, '/wekinator/control/startRunning' if run else '/wekinator/control/stopRunning')
+        wekinator_running = run
+        send_osc_message(host, port, '/wekinator/control/startRunning' if run else '/wekinator/control/stopRunning')
 
     # automatic sending
-    if op.par.Sendingmode.menuIndex == 0 and op.inputs:
-        vals = [c[0] for c in op.inputs[0].chans()[:op.par.Numinputs.eval()]]
-        send_to_wekinator(op, op.par.Inputmessage.eval(), *vals)
-
-    # build output channels
-    with data_lock:
-        main = op.par.Outputmessage.eval()
-        outs = received_osc_data.get(main, [])
-        for i,v in enumerate(outs):
-            op.appendChan(f'output{i+1}').vals=[v]
-        for addr,vals in received_osc_data.items():
-            if addr == main: continue
-            base = addr.replace('/','_').strip('_')
-            for i,v in enumerate(vals):
-                op.appendChan(f'{base}{i+1}').vals=[v]
-        for gid,tr in dtw_triggers.items():
-            op.appendChan(f'dtw_event_{gid}').vals=[tr]
-        dtw_triggers.clear()
+    if p.Sendingmode.menuIndex == 0 and op.inputs:
+        send_inputs(host, port, p.Inputmessage.eval(), op.inputs[0], p.Numinputs.eval())
+
+    # drain packets queued by the receive thread
+    while osc_inbox:
+        addr, vals = osc_inbox.popleft()
+        received_osc_data[addr] = vals
+    while dtw_inbox:
+        dtw_triggers[dtw_inbox.popleft()] = 1
+
+    # output channels are only cleared and re-created when the layout changes;
+    # otherwise the existing channels just receive new sample values
+    main = p.Outputmessage.eval()
+    # DTW ids are part of the layout on purpose: a dtw_event_<N> channel exists
+    # only for the cook its event arrives in (as before), so each event costs
+    # one rebuild when it appears and one when it goes away
+    sig  = (main, tuple((a, len(v)) for a,v in received_osc_data.items()), tuple(dtw_triggers))
+    names = op.fetch('chan_names', None, search=False)
+    if names is None or op.fetch('chan_sig', None, search=False) != sig or op.numChans != len(names):
+        names = build_chan_names(*sig)
+        op.clear()
+        for name in names: op.appendChan(name)
+        op.store('chan_sig', sig); op.store('chan_names', names)
+    vals = list(received_osc_data.get(main, []))
+    for addr,v in received_osc_data.items():
+        if addr != main: vals += v
+    vals += dtw_triggers.values()
+    dtw_triggers.clear()
 
+    # write every channel's single sample in one call instead of one per value
     op.numSamples = 1
-    op.rate       = op.par.Samplerate.eval()
+    if vals:
+        op.copyNumpyArray(np.array(vals, dtype=np.float32).reshape(len(vals), 1))
+    op.rate       = p.Samplerate.eval()
 
 def onExit():
-    global sock_in
-    if sock_in:
-        try: sock_in.close()
+    global _send_sock
+    stop_receiver()
+    if _send_sock:
+        try: _send_sock.close()
         except: pass
-        sock_in = None
-    if hasattr(init_sockets,'_thread_started'):
-        init_sockets._thread_started = False
+        _send_sock = None